@@ -1,19 +1,33 @@
 # QBR Auto-Drafter Components
-from .dashboard import render_dashboard, render_account_metrics, render_portfolio_overview
-from .qbr_generator import QBRGenerator, QBROutput
-from .exporters import export_to_markdown, export_to_pdf
-from .validator import QBRValidator, ValidationResult, format_validation_status_html
+#
+# Re-exports are lazy (PEP 562): app.py imports this package at the top of
+# every run, and eagerly importing qbr_generator/exporters here would pull
+# LangChain, pydantic and fpdf into cold start before the password gate —
+# defeating the deferred imports at the call sites. Each symbol's module
+# is only imported on first attribute access.
+from importlib import import_module
 
-__all__ = [
-    'render_dashboard',
-    'render_account_metrics', 
-    'render_portfolio_overview',
-    'QBRGenerator',
-    'QBROutput',
-    'export_to_markdown',
-    'export_to_pdf',
-    'QBRValidator',
-    'ValidationResult',
-    'format_validation_status_html'
-]
+_EXPORTS = {
+    'render_dashboard': '.dashboard',
+    'render_account_metrics': '.dashboard',
+    'render_portfolio_overview': '.dashboard',
+    'QBRGenerator': '.qbr_generator',
+    'QBROutput': '.qbr_generator',
+    'export_to_markdown': '.exporters',
+    'export_to_pdf': '.exporters',
+    'QBRValidator': '.validator',
+    'ValidationResult': '.validator',
+    'format_validation_status_html': '.validator',
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module = import_module(_EXPORTS[name], __name__)
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(module, name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
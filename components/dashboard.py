@@ -5,7 +5,9 @@ Visual metrics, charts, and portfolio overview using Plotly and Streamlit
 
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
+from plotly.subplots import make_subplots
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, List
 
@@ -27,26 +29,124 @@ COLORS = {
 }
 
 
+# Register a transparent-background template once at import so figure
+# builders inherit it instead of each repeating the bgcolor kwargs, and
+# share one config dict across st.plotly_chart calls so Streamlit hashes
+# the same object every time
+pio.templates['qbr'] = go.layout.Template(
+    layout=dict(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+)
+pio.templates.default = 'qbr+plotly_white'
+
+PLOTLY_NO_TOOLBAR = {'displayModeBar': False}
+
+
+def _hex_to_rgba(hex_color: str, alpha: float) -> str:
+    """Convert a #RRGGBB hex color to an rgba() string."""
+    r, g, b = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+    return f'rgba({r},{g},{b},{alpha})'
+
+
+# Radar trace palette, with the translucent fills parsed from hex once at
+# import instead of per trace on every dashboard render
+RADAR_LINECOLORS = (COLORS['primary'], COLORS['success'], COLORS['warning'],
+                    COLORS['danger'], COLORS['purple'])
+RADAR_FILLCOLORS = tuple(_hex_to_rgba(c, 0.2) for c in RADAR_LINECOLORS)
+
+_CHANNEL_ICONS = {
+    'Email': '📧',
+    'Chat': '💬',
+    'In-App': '📱',
+    'Phone': '📞',
+    'Slack': '💬'
+}
+
+# HTML for the renderers, hoisted to module scope so each rerun only
+# interpolates values instead of re-building the literals; palette colors
+# are baked in at import (double braces mark the runtime placeholders)
+_ACCOUNT_HEADER_TPL = f"""
+<div style="background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['purple']} 100%);
+            padding: 1.5rem 2rem; border-radius: 16px; margin-bottom: 1.5rem; color: white;">
+    <h2 style="margin: 0; font-size: 1.8rem;">{{account_name}}</h2>
+    <div style="display: flex; gap: 1rem; margin-top: 0.5rem; align-items: center; flex-wrap: wrap;">
+        <span style="background: rgba(255,255,255,0.2); padding: 0.25rem 0.75rem; border-radius: 12px;
+                    font-size: 0.875rem; font-weight: 600;">{{plan_type}}</span>
+        <span style="opacity: 0.9;">👥 {{active_users}} active users</span>
+        <span style="opacity: 0.9;">•</span>
+        <span style="background: rgba(255,255,255,0.15); padding: 0.25rem 0.75rem; border-radius: 12px;
+                    font-size: 0.875rem;">{{channel_icon}} Prefers {{channel}}</span>
+    </div>
+</div>
+"""
+
+_TICKET_CARD_TPL = """<div class="metric-card" style="background: var(--app-bg-card); border-radius: 12px; padding: 1rem; text-align: center; box-shadow: 0 2px 8px var(--app-shadow); border: 1px solid var(--app-border); height: 220px; display: flex; flex-direction: column; justify-content: center; align-items: center;"><div style="font-size: 2rem; font-weight: 700; color: var(--app-text-primary);">{tickets}</div><div style="color: var(--app-text-secondary); font-size: 0.8rem;">Support Tickets</div><div style="margin-top: 0.5rem; padding-top: 0.5rem; border-top: 1px solid var(--app-border); width: 100%;"><div style="display: flex; justify-content: space-between; align-items: center;"><span style="font-size: 0.7rem; color: var(--app-text-secondary);">Per User:</span><span style="font-size: 0.8rem; font-weight: 600; color: {tpu_color};">{tickets_per_user:.2f}</span></div><div style="display: flex; justify-content: space-between; align-items: center; margin-top: 0.25rem;"><span style="font-size: 0.7rem; color: var(--app-text-secondary);">Response:</span><span style="font-size: 0.8rem; font-weight: 600; color: {rt_color};">{response_time}h ({rt_status})</span></div><div style="display: flex; justify-content: space-between; align-items: center; margin-top: 0.25rem;"><span style="font-size: 0.7rem; color: var(--app-text-secondary);">Channel:</span><span style="font-size: 0.8rem; font-weight: 600; color: var(--app-text-primary);">{channel_icon} {channel}</span></div>{channel_hint_html}</div></div>"""
+
+_CHANNEL_HINT_HTML = (
+    f"<div style='font-size: 0.65rem; color: {COLORS['warning']}; "
+    "margin-top: 0.25rem;'>💡 Consider Chat for faster response</div>"
+)
+
+_CRM_NOTES_TPL = """
+<div style="margin-top: 1rem; padding-top: 0.75rem; border-top: 1px solid var(--app-border);">
+    <div style="font-size: 0.7rem; color: var(--app-text-secondary); text-transform: uppercase; letter-spacing: 0.5px;">CRM Notes</div>
+    <div style="font-size: 0.8rem; color: var(--app-text-primary); margin-top: 0.4rem;
+                font-style: italic; line-height: 1.4;">"{notes}..."</div>
+</div>
+"""
+
+_AUTOMATION_TPL = f"""
+<div style="margin: 10px 0;">
+    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+        <span style="color: var(--app-text-secondary); font-size: 14px;">Automation Adoption</span>
+        <span style="color: {{color}}; font-weight: 600;">{{pct:.0f}}%</span>
+    </div>
+    <div style="background: var(--app-bg-primary); border-radius: 10px; height: 12px; overflow: hidden;">
+        <div style="background: linear-gradient(90deg, {{color}}, {COLORS['primary']});
+                    width: {{pct}}%; height: 100%; border-radius: 10px;
+                    transition: width 0.5s ease;"></div>
+    </div>
+</div>
+"""
+
+_PORTFOLIO_HEADER_HTML = f"""
+<div style="background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['purple']} 100%);
+            padding: 2rem; border-radius: 16px; margin-bottom: 2rem; color: white;">
+    <h2 style="margin: 0; font-size: 2rem;">📊 Portfolio Overview</h2>
+    <p style="opacity: 0.9; margin-top: 0.5rem;">Q3 2025 Customer Health Summary</p>
+</div>
+"""
+
+
+# Threshold ladders as sorted arrays: np.searchsorted(..., side='right')
+# turns each if/elif chain into a branchless table lookup and also works
+# on whole columns at once for portfolio-wide coloring
+_RISK_THRESHOLDS = np.array([0.3, 0.6])
+_RISK_COLORS = (COLORS['success'], COLORS['warning'], COLORS['danger'])
+_RISK_LABELS = ('Low Risk', 'Medium Risk', 'High Risk')
+
+_HEALTH_THRESHOLDS = np.array([40, 60, 80])
+_HEALTH_COLORS = (COLORS['danger'], COLORS['warning'], COLORS['info'], COLORS['success'])
+
+_NPS_THRESHOLDS = np.array([6, 8])
+_NPS_COLORS = (COLORS['danger'], COLORS['warning'], COLORS['success'])
+_NPS_LABELS = ('Detractor', 'Passive', 'Promoter')
+
+
 def get_risk_color(risk_score: float) -> str:
     """Return color based on risk score threshold"""
-    if risk_score >= 0.6:
-        return COLORS['danger']
-    elif risk_score >= 0.3:
-        return COLORS['warning']
-    return COLORS['success']
+    return _RISK_COLORS[int(np.searchsorted(_RISK_THRESHOLDS, risk_score, side='right'))]
 
 
 def get_risk_label(risk_score: float) -> str:
     """Return risk label based on score"""
-    if risk_score >= 0.6:
-        return "High Risk"
-    elif risk_score >= 0.3:
-        return "Medium Risk"
-    return "Low Risk"
+    return _RISK_LABELS[int(np.searchsorted(_RISK_THRESHOLDS, risk_score, side='right'))]
 
 
+@st.cache_data(show_spinner=False, max_entries=256)
 def create_risk_gauge(risk_score: float, account_name: str = "") -> go.Figure:
     """Create a radial gauge chart for risk score"""
+    # Round so near-identical reruns hit the cache instead of rebuilding
+    risk_score = round(risk_score, 3)
     color = get_risk_color(risk_score)
     
     fig = go.Figure(go.Indicator(
@@ -73,8 +173,6 @@ def create_risk_gauge(risk_score: float, account_name: str = "") -> go.Figure:
     ))
     
     fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
         height=220,
         margin=dict(l=20, r=20, t=50, b=20)
     )
@@ -82,16 +180,11 @@ def create_risk_gauge(risk_score: float, account_name: str = "") -> go.Figure:
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=256)
 def create_health_gauge(scat_score: float) -> go.Figure:
     """Create a health score gauge (SCAT score)"""
-    if scat_score >= 80:
-        color = COLORS['success']
-    elif scat_score >= 60:
-        color = COLORS['info']
-    elif scat_score >= 40:
-        color = COLORS['warning']
-    else:
-        color = COLORS['danger']
+    scat_score = round(scat_score, 3)
+    color = _HEALTH_COLORS[int(np.searchsorted(_HEALTH_THRESHOLDS, scat_score, side='right'))]
     
     fig = go.Figure(go.Indicator(
         mode="gauge+number",
@@ -113,8 +206,6 @@ def create_health_gauge(scat_score: float) -> go.Figure:
     ))
     
     fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
         height=220,
         margin=dict(l=20, r=20, t=50, b=20)
     )
@@ -122,17 +213,13 @@ def create_health_gauge(scat_score: float) -> go.Figure:
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=256)
 def create_nps_indicator(nps_score: float) -> go.Figure:
     """Create NPS score visualization"""
-    if nps_score >= 8:
-        color = COLORS['success']
-        label = "Promoter"
-    elif nps_score >= 6:
-        color = COLORS['warning']
-        label = "Passive"
-    else:
-        color = COLORS['danger']
-        label = "Detractor"
+    nps_score = round(nps_score, 3)
+    band = int(np.searchsorted(_NPS_THRESHOLDS, nps_score, side='right'))
+    color = _NPS_COLORS[band]
+    label = _NPS_LABELS[band]
     
     fig = go.Figure(go.Indicator(
         mode="number+delta",
@@ -144,8 +231,6 @@ def create_nps_indicator(nps_score: float) -> go.Figure:
     ))
     
     fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
         height=220,
         margin=dict(l=20, r=20, t=50, b=20)
     )
@@ -153,8 +238,30 @@ def create_nps_indicator(nps_score: float) -> go.Figure:
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=256)
+def create_account_gauge_row(risk_score: float, scat_score: float, nps_score: float) -> go.Figure:
+    """
+    Combine the three account indicators into one figure.
+
+    Reuses the traces from the individual gauge builders but ships them as
+    a single Plotly JSON payload and one frontend draw instead of three
+    separate st.plotly_chart mounts.
+    """
+    fig = make_subplots(rows=1, cols=3, specs=[[{'type': 'indicator'}] * 3])
+    fig.add_trace(create_risk_gauge(risk_score).data[0], row=1, col=1)
+    fig.add_trace(create_health_gauge(scat_score).data[0], row=1, col=2)
+    fig.add_trace(create_nps_indicator(nps_score).data[0], row=1, col=3)
+    fig.update_layout(
+        height=220,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
 def create_usage_growth_chart(growth_pct: float, account_name: str) -> go.Figure:
     """Create usage growth bar visualization"""
+    growth_pct = round(growth_pct, 4)
     color = COLORS['success'] if growth_pct >= 0 else COLORS['danger']
     
     fig = go.Figure(go.Bar(
@@ -175,8 +282,6 @@ def create_usage_growth_chart(growth_pct: float, account_name: str) -> go.Figure
             x=0.5,
             xanchor='center'
         ),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
         height=150,
         margin=dict(l=30, r=30, t=45, b=40),
         xaxis={'range': [-50, 50], 'showgrid': True, 'gridcolor': 'rgba(0,0,0,0.08)',
@@ -194,49 +299,39 @@ def create_automation_progress(adoption_pct: float) -> None:
     """Render automation adoption as a styled progress bar"""
     color = COLORS['success'] if adoption_pct >= 0.6 else (COLORS['warning'] if adoption_pct >= 0.3 else COLORS['danger'])
     
-    st.markdown(f"""
-    <div style="margin: 10px 0;">
-        <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
-            <span style="color: var(--app-text-secondary); font-size: 14px;">Automation Adoption</span>
-            <span style="color: {color}; font-weight: 600;">{adoption_pct * 100:.0f}%</span>
-        </div>
-        <div style="background: var(--app-bg-primary); border-radius: 10px; height: 12px; overflow: hidden;">
-            <div style="background: linear-gradient(90deg, {color}, {COLORS['primary']}); 
-                        width: {adoption_pct * 100}%; height: 100%; border-radius: 10px;
-                        transition: width 0.5s ease;"></div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_AUTOMATION_TPL.format(color=color, pct=adoption_pct * 100), unsafe_allow_html=True)
 
 
+@st.cache_data(show_spinner=False)
 def create_radar_chart(accounts_df: pd.DataFrame) -> go.Figure:
     """Create radar chart comparing all accounts across key metrics"""
     categories = ['Usage Growth', 'Automation', 'NPS', 'Health (SCAT)', 'Low Risk']
     
     fig = go.Figure()
     
-    colors = [COLORS['primary'], COLORS['success'], COLORS['warning'], COLORS['danger'], COLORS['purple']]
-    
-    for idx, (_, row) in enumerate(accounts_df.iterrows()):
-        # Normalize values to 0-100 scale
-        values = [
-            max(0, min(100, (row['usage_growth_qoq'] + 0.5) * 100)),  # -50% to +50% -> 0-100
-            row['automation_adoption_pct'] * 100,
-            row['nps_score'] * 10,  # 0-10 -> 0-100
-            row['scat_score'],
-            (1 - row['risk_engine_score']) * 100  # Invert risk for "Low Risk"
-        ]
-        values.append(values[0])  # Close the polygon
-        
-        categories_closed = categories + [categories[0]]
-        
+    # Normalize all metrics to a 0-100 scale in five vectorized column ops,
+    # then slice per-account rows — no iterrows, no per-row Python arithmetic
+    values_matrix = np.stack([
+        np.clip((accounts_df['usage_growth_qoq'].to_numpy(dtype=float) + 0.5) * 100, 0, 100),  # -50% to +50% -> 0-100
+        accounts_df['automation_adoption_pct'].to_numpy(dtype=float) * 100,
+        accounts_df['nps_score'].to_numpy(dtype=float) * 10,  # 0-10 -> 0-100
+        accounts_df['scat_score'].to_numpy(dtype=float),
+        (1 - accounts_df['risk_engine_score'].to_numpy(dtype=float)) * 100  # Invert risk for "Low Risk"
+    ], axis=1)
+
+    categories_closed = categories + [categories[0]]
+
+    for idx, name in enumerate(accounts_df['account_name'].to_numpy()):
+        row_values = values_matrix[idx].tolist()
+        row_values.append(row_values[0])  # Close the polygon
+
         fig.add_trace(go.Scatterpolar(
-            r=values,
+            r=row_values,
             theta=categories_closed,
             fill='toself',
-            fillcolor=f'rgba{tuple(int(colors[idx % len(colors)].lstrip("#")[i:i+2], 16) for i in (0, 2, 4)) + (0.2,)}',
-            line=dict(color=colors[idx % len(colors)], width=2),
-            name=row['account_name']
+            fillcolor=RADAR_FILLCOLORS[idx % len(RADAR_FILLCOLORS)],
+            line=dict(color=RADAR_LINECOLORS[idx % len(RADAR_LINECOLORS)], width=2),
+            name=name
         ))
     
     fig.update_layout(
@@ -258,8 +353,6 @@ def create_radar_chart(accounts_df: pd.DataFrame) -> go.Figure:
             ),
             bgcolor='rgba(0,0,0,0)'
         ),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
         showlegend=True,
         legend=dict(
             orientation="h",
@@ -275,19 +368,22 @@ def create_radar_chart(accounts_df: pd.DataFrame) -> go.Figure:
     return fig
 
 
+@st.cache_data(show_spinner=False)
 def create_portfolio_risk_pie(accounts_df: pd.DataFrame) -> go.Figure:
     """Create pie chart showing risk distribution across portfolio"""
-    risk_counts = {
-        'Low Risk': len(accounts_df[accounts_df['risk_engine_score'] < 0.3]),
-        'Medium Risk': len(accounts_df[(accounts_df['risk_engine_score'] >= 0.3) & (accounts_df['risk_engine_score'] < 0.6)]),
-        'High Risk': len(accounts_df[accounts_df['risk_engine_score'] >= 0.6])
-    }
-    
+    # Single pd.cut pass instead of three boolean-mask scans of the column
+    risk_counts = pd.cut(
+        accounts_df['risk_engine_score'],
+        bins=[-float('inf'), 0.3, 0.6, float('inf')],
+        labels=['Low Risk', 'Medium Risk', 'High Risk'],
+        right=False
+    ).value_counts().reindex(['Low Risk', 'Medium Risk', 'High Risk'], fill_value=0)
+
     colors = [COLORS['success'], COLORS['warning'], COLORS['danger']]
-    
+
     fig = go.Figure(data=[go.Pie(
-        labels=list(risk_counts.keys()),
-        values=list(risk_counts.values()),
+        labels=risk_counts.index.tolist(),
+        values=risk_counts.values.tolist(),
         hole=0.6,
         marker_colors=colors,
         textinfo='label+value',
@@ -296,7 +392,7 @@ def create_portfolio_risk_pie(accounts_df: pd.DataFrame) -> go.Figure:
     )])
     
     # Add center annotation
-    total = sum(risk_counts.values())
+    total = int(risk_counts.sum())
     fig.add_annotation(
         text=f"<b>{total}</b><br>Accounts",
         x=0.5, y=0.5,
@@ -311,8 +407,6 @@ def create_portfolio_risk_pie(accounts_df: pd.DataFrame) -> go.Figure:
             x=0.5,
             xanchor='center'
         ),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
         showlegend=False,
         height=300,
         margin=dict(l=20, r=20, t=40, b=20)
@@ -323,49 +417,45 @@ def create_portfolio_risk_pie(accounts_df: pd.DataFrame) -> go.Figure:
 
 def render_account_metrics(client_data: Dict[str, Any]) -> None:
     """Render comprehensive metrics dashboard for a single account"""
-    # Preferred channel with icon
+    # Bind every field to a local once, instead of repeating dict lookups
+    # across the header, gauges, ticket card, and CRM block below
+    account_name = client_data['account_name']
     channel = client_data['preferred_channel']
-    channel_icons = {
-        'Email': '📧',
-        'Chat': '💬',
-        'In-App': '📱',
-        'Phone': '📞',
-        'Slack': '💬'
-    }
-    channel_icon = channel_icons.get(channel, '📨')
-    
+    # Nullable Int32 columns surface missing values as pd.NA, which raises
+    # on comparison and renders as '<NA>' in HTML — normalize to 0 up front
+    users = client_data['active_users']
+    users = int(users) if pd.notna(users) else 0
+    tickets = client_data['tickets_last_quarter']
+    tickets = int(tickets) if pd.notna(tickets) else 0
+    response_time = client_data['avg_response_time']
+    notes_preview = client_data['crm_notes'][:120]
+    channel_icon = _CHANNEL_ICONS.get(channel, '📨')
+
     # Account header
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['purple']} 100%);
-                padding: 1.5rem 2rem; border-radius: 16px; margin-bottom: 1.5rem; color: white;">
-        <h2 style="margin: 0; font-size: 1.8rem;">{client_data['account_name']}</h2>
-        <div style="display: flex; gap: 1rem; margin-top: 0.5rem; align-items: center; flex-wrap: wrap;">
-            <span style="background: rgba(255,255,255,0.2); padding: 0.25rem 0.75rem; border-radius: 12px; 
-                        font-size: 0.875rem; font-weight: 600;">{client_data['plan_type']}</span>
-            <span style="opacity: 0.9;">👥 {client_data['active_users']} active users</span>
-            <span style="opacity: 0.9;">•</span>
-            <span style="background: rgba(255,255,255,0.15); padding: 0.25rem 0.75rem; border-radius: 12px; 
-                        font-size: 0.875rem;">{channel_icon} Prefers {channel}</span>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Metrics Row - 4 equal columns
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.plotly_chart(create_risk_gauge(client_data['risk_engine_score']), use_container_width=True, config={'displayModeBar': False})
-    
-    with col2:
-        st.plotly_chart(create_health_gauge(client_data['scat_score']), use_container_width=True, config={'displayModeBar': False})
-    
-    with col3:
-        st.plotly_chart(create_nps_indicator(client_data['nps_score']), use_container_width=True, config={'displayModeBar': False})
-    
+    st.markdown(_ACCOUNT_HEADER_TPL.format(
+        account_name=account_name,
+        plan_type=client_data['plan_type'],
+        active_users=users,
+        channel_icon=channel_icon,
+        channel=channel
+    ), unsafe_allow_html=True)
+
+    # Metrics Row - one combined gauge figure spanning three columns plus
+    # the ticket card
+    col_gauges, col4 = st.columns([3, 1])
+
+    with col_gauges:
+        st.plotly_chart(
+            create_account_gauge_row(
+                client_data['risk_engine_score'],
+                client_data['scat_score'],
+                client_data['nps_score']
+            ),
+            use_container_width=True, config=PLOTLY_NO_TOOLBAR
+        )
+
     with col4:
         # Calculate tickets per user ratio
-        tickets = client_data['tickets_last_quarter']
-        users = client_data['active_users']
         tickets_per_user = tickets / users if users > 0 else 0
         
         # Determine color based on tickets per user (lower is better)
@@ -380,7 +470,6 @@ def render_account_metrics(client_data: Dict[str, Any]) -> None:
             tpu_label = "High"
         
         # Response time assessment (industry standard: <2h is good)
-        response_time = client_data['avg_response_time']
         if response_time <= 1:
             rt_color = COLORS['success']
             rt_status = "Excellent"
@@ -394,81 +483,79 @@ def render_account_metrics(client_data: Dict[str, Any]) -> None:
             rt_color = COLORS['danger']
             rt_status = "Slow"
         
-        # Preferred channel with icon
-        channel = client_data['preferred_channel']
-        channel_icons = {
-            'Email': '📧',
-            'Chat': '💬',
-            'In-App': '📱',
-            'Phone': '📞',
-            'Slack': '💬'
-        }
-        channel_icon = channel_icons.get(channel, '📨')
-        
         # Channel speed indicator - show hint for slow channels with slow response
         slow_channels = ['Email']
         show_channel_hint = channel in slow_channels and response_time > 2
-        
-        # Build the HTML without conditional empty strings to avoid Streamlit parsing issues
-        channel_hint_html = ""
-        if show_channel_hint:
-            channel_hint_html = f"<div style='font-size: 0.65rem; color: {COLORS['warning']}; margin-top: 0.25rem;'>💡 Consider Chat for faster response</div>"
-        
-        st.markdown(f"""<div class="metric-card" style="background: var(--app-bg-card); border-radius: 12px; padding: 1rem; text-align: center; box-shadow: 0 2px 8px var(--app-shadow); border: 1px solid var(--app-border); height: 220px; display: flex; flex-direction: column; justify-content: center; align-items: center;"><div style="font-size: 2rem; font-weight: 700; color: var(--app-text-primary);">{tickets}</div><div style="color: var(--app-text-secondary); font-size: 0.8rem;">Support Tickets</div><div style="margin-top: 0.5rem; padding-top: 0.5rem; border-top: 1px solid var(--app-border); width: 100%;"><div style="display: flex; justify-content: space-between; align-items: center;"><span style="font-size: 0.7rem; color: var(--app-text-secondary);">Per User:</span><span style="font-size: 0.8rem; font-weight: 600; color: {tpu_color};">{tickets_per_user:.2f}</span></div><div style="display: flex; justify-content: space-between; align-items: center; margin-top: 0.25rem;"><span style="font-size: 0.7rem; color: var(--app-text-secondary);">Response:</span><span style="font-size: 0.8rem; font-weight: 600; color: {rt_color};">{response_time}h ({rt_status})</span></div><div style="display: flex; justify-content: space-between; align-items: center; margin-top: 0.25rem;"><span style="font-size: 0.7rem; color: var(--app-text-secondary);">Channel:</span><span style="font-size: 0.8rem; font-weight: 600; color: var(--app-text-primary);">{channel_icon} {channel}</span></div>{channel_hint_html}</div></div>""", unsafe_allow_html=True)
+
+        st.markdown(_TICKET_CARD_TPL.format(
+            tickets=tickets,
+            tpu_color=tpu_color,
+            tickets_per_user=tickets_per_user,
+            rt_color=rt_color,
+            response_time=response_time,
+            rt_status=rt_status,
+            channel_icon=channel_icon,
+            channel=channel,
+            channel_hint_html=_CHANNEL_HINT_HTML if show_channel_hint else ""
+        ), unsafe_allow_html=True)
     
     # Second row - Growth and Automation
-    st.markdown("<div style='height: 1rem;'></div>", unsafe_allow_html=True)
+    st.html("<div class='qbr-gap-md'></div>")
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(create_usage_growth_chart(client_data['usage_growth_qoq'], client_data['account_name']), 
-                       use_container_width=True, config={'displayModeBar': False})
-    
+        st.plotly_chart(create_usage_growth_chart(client_data['usage_growth_qoq'], account_name),
+                       use_container_width=True, config=PLOTLY_NO_TOOLBAR)
+
     with col2:
         create_automation_progress(client_data['automation_adoption_pct'])
-        st.markdown(f"""
-        <div style="margin-top: 1rem; padding-top: 0.75rem; border-top: 1px solid var(--app-border);">
-            <div style="font-size: 0.7rem; color: var(--app-text-secondary); text-transform: uppercase; letter-spacing: 0.5px;">CRM Notes</div>
-            <div style="font-size: 0.8rem; color: var(--app-text-primary); margin-top: 0.4rem; 
-                        font-style: italic; line-height: 1.4;">"{client_data['crm_notes'][:120]}..."</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_CRM_NOTES_TPL.format(notes=notes_preview), unsafe_allow_html=True)
+
+
+@st.cache_data(show_spinner=False)
+def _portfolio_summary(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Aggregate KPIs for the portfolio header, computed once per DataFrame.
+
+    The overview re-renders on every rerun (tab switches, expander toggles);
+    caching the column reductions means only the st.metric calls repeat.
+    """
+    return {
+        'total_accounts': len(df),
+        'high_risk': int((df['risk_engine_score'] >= 0.6).sum()),
+        'avg_nps': float(df['nps_score'].mean()),
+        'total_users': int(df['active_users'].sum()),
+        'avg_automation': float(df['automation_adoption_pct'].mean() * 100),
+    }
 
 
 def render_portfolio_overview(df: pd.DataFrame) -> None:
     """Render portfolio-level overview dashboard"""
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['purple']} 100%);
-                padding: 2rem; border-radius: 16px; margin-bottom: 2rem; color: white;">
-        <h2 style="margin: 0; font-size: 2rem;">📊 Portfolio Overview</h2>
-        <p style="opacity: 0.9; margin-top: 0.5rem;">Q3 2025 Customer Health Summary</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
+    st.markdown(_PORTFOLIO_HEADER_HTML, unsafe_allow_html=True)
+
+    summary = _portfolio_summary(df)
+
     # Summary metrics
     col1, col2, col3, col4, col5 = st.columns(5)
-    
+
     with col1:
-        st.metric("Total Accounts", len(df))
-    
+        st.metric("Total Accounts", summary['total_accounts'])
+
     with col2:
-        high_risk = len(df[df['risk_engine_score'] >= 0.6])
+        high_risk = summary['high_risk']
         st.metric("High Risk", high_risk, delta=f"-{high_risk}" if high_risk > 0 else "0", delta_color="inverse")
-    
+
     with col3:
-        avg_nps = df['nps_score'].mean()
-        st.metric("Avg NPS", f"{avg_nps:.1f}")
-    
+        st.metric("Avg NPS", f"{summary['avg_nps']:.1f}")
+
     with col4:
-        total_users = df['active_users'].sum()
-        st.metric("Total Active Users", f"{total_users:,}")
-    
+        st.metric("Total Active Users", f"{summary['total_users']:,}")
+
     with col5:
-        avg_automation = df['automation_adoption_pct'].mean() * 100
-        st.metric("Avg Automation", f"{avg_automation:.0f}%")
+        st.metric("Avg Automation", f"{summary['avg_automation']:.0f}%")
     
-    st.markdown("<div style='height: 1.5rem;'></div>", unsafe_allow_html=True)
+    st.html("<div class='qbr-gap-lg'></div>")
     
     # Charts row
     col1, col2 = st.columns([1, 2])
@@ -480,10 +567,16 @@ def render_portfolio_overview(df: pd.DataFrame) -> None:
         st.plotly_chart(create_radar_chart(df), use_container_width=True)
 
 
+@st.cache_data(show_spinner=False)
+def _account_index(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Row dicts keyed by account name — O(1) lookup instead of a mask scan."""
+    return {row['account_name']: row for row in df.to_dict(orient='records')}
+
+
 def render_dashboard(df: pd.DataFrame, selected_account: str = None) -> None:
     """Main dashboard renderer - handles both portfolio and account views"""
     if selected_account:
-        client_data = df[df['account_name'] == selected_account].iloc[0].to_dict()
+        client_data = _account_index(df)[selected_account]
         render_account_metrics(client_data)
     else:
         render_portfolio_overview(df)
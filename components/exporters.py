@@ -17,6 +17,21 @@ from fpdf import FPDF
 # Path to Monday.com logo
 LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'Monday-Com-Logo.png')
 
+# Logo bytes read once per process. FPDF caches images per document, but a
+# new document is built for every export (the instance itself can't be
+# reused across documents), so without this each export re-read the PNG
+# from disk for the header, footer and cover.
+_LOGO_BYTES: Optional[bytes] = None
+
+
+def _logo_stream() -> Optional[io.BytesIO]:
+    """Return the cached logo as a fresh stream, or None if unavailable."""
+    global _LOGO_BYTES
+    if _LOGO_BYTES is None and os.path.exists(LOGO_PATH):
+        with open(LOGO_PATH, 'rb') as fh:
+            _LOGO_BYTES = fh.read()
+    return io.BytesIO(_LOGO_BYTES) if _LOGO_BYTES else None
+
 
 # Monday.com brand colors (RGB)
 MONDAY_COLORS = {
@@ -140,9 +155,10 @@ class MondayPDF(FPDF):
         
         # Add Monday.com logo
         try:
-            if os.path.exists(LOGO_PATH):
+            logo = _logo_stream()
+            if logo is not None:
                 # Add logo image (scaled to fit header)
-                self.image(LOGO_PATH, x=8, y=5, h=15)
+                self.image(logo, x=8, y=5, h=15)
         except Exception:
             # Fallback to text if logo fails
             self.set_font('Helvetica', 'B', 14)
@@ -186,9 +202,10 @@ class MondayPDF(FPDF):
         
         # Add Monday.com logo centered at top
         try:
-            if os.path.exists(LOGO_PATH):
+            logo = _logo_stream()
+            if logo is not None:
                 # Center the logo (logo width ~60, page width 210)
-                self.image(LOGO_PATH, x=75, y=12, h=20)
+                self.image(logo, x=75, y=12, h=20)
         except Exception:
             pass  # Skip logo if there's an issue
         
@@ -583,9 +600,41 @@ def export_batch_to_markdown(
     Returns:
         Combined markdown document
     """
+    return ''.join(_iter_batch_markdown(qbr_results, all_client_data))
+
+
+def export_batch_to_markdown_bytes(
+    qbr_results: Dict[str, str],
+    all_client_data: Dict[str, Dict[str, Any]]
+) -> bytes:
+    """
+    UTF-8 bytes of the combined batch document, for download buttons.
+
+    Encodes section by section into a BytesIO rather than materializing
+    the joined document as a second full-size str before encoding —
+    halves peak memory on large portfolios.
+
+    Args:
+        qbr_results: Dictionary of account_name -> qbr_content
+        all_client_data: Dictionary of account_name -> client_data
+
+    Returns:
+        Combined markdown document encoded as UTF-8
+    """
+    buf = io.BytesIO()
+    for part in _iter_batch_markdown(qbr_results, all_client_data):
+        buf.write(part.encode('utf-8'))
+    return buf.getvalue()
+
+
+def _iter_batch_markdown(
+    qbr_results: Dict[str, str],
+    all_client_data: Dict[str, Dict[str, Any]]
+):
+    """Yield the combined batch document section by section."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    
-    document = f"""---
+
+    yield f"""---
 title: Quarterly Business Review - Portfolio Summary
 quarter: Q3 2025
 accounts: {len(qbr_results)}
@@ -604,8 +653,8 @@ generated: {timestamp}
 | Account | Plan | Risk Level | NPS | Growth |
 |---------|------|------------|-----|--------|
 """
-    
-    # Add summary table
+
+    # Summary table
     for account_name, client_data in all_client_data.items():
         risk = client_data.get('risk_engine_score', 0)
         risk_emoji = "🟢" if risk < 0.3 else "🟡" if risk < 0.6 else "🔴"
@@ -614,16 +663,12 @@ generated: {timestamp}
         if isinstance(growth, float) and abs(growth) <= 1:
             growth = growth * 100
         plan = client_data.get('plan_type', 'N/A')
-        
-        document += f"| {account_name} | {plan} | {risk_emoji} {risk:.0%} | {nps}/10 | {growth:+.0f}% |\n"
-    
-    document += "\n---\n\n"
-    
-    # Add individual QBRs
+
+        yield f"| {account_name} | {plan} | {risk_emoji} {risk:.0%} | {nps}/10 | {growth:+.0f}% |\n"
+
+    yield "\n---\n\n"
+
+    # Individual QBRs
     for account_name, qbr_content in qbr_results.items():
-        document += f"\n# {account_name}\n\n"
-        document += qbr_content
-        document += "\n\n---\n"
-    
-    return document
+        yield f"\n# {account_name}\n\n{qbr_content}\n\n---\n"
 
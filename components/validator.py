@@ -14,7 +14,6 @@ import json
 import re
 from typing import Dict, Any, Tuple, List, Optional
 from dataclasses import dataclass
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 
 
@@ -184,19 +183,26 @@ class QBRValidator:
     
     MAX_RETRIES = 2  # Maximum regeneration attempts before showing with warnings
     
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", http_client=None):
         """
         Initialize the validator.
-        
+
         Args:
             api_key: OpenAI API key
             model: Model to use for validation (default: gpt-4o-mini for cost efficiency)
+            http_client: Optional shared httpx.Client so the validator reuses
+                the generator's connection pool instead of opening its own
         """
+        # Deferred import, mirroring QBRGenerator: keeps the OpenAI SDK out
+        # of the module import path until a validator is constructed
+        from langchain_openai import ChatOpenAI
+
         self.llm = ChatOpenAI(
             model=model,
             api_key=api_key,
             temperature=0,  # Deterministic for consistent validation
-            max_tokens=2000
+            max_tokens=2000,
+            http_client=http_client
         )
     
     def validate(